@@ -0,0 +1,7 @@
+from pathlib import Path
+import orjson
+
+ABI_DIR = Path(__file__).parent
+
+ERC20_ABI = orjson.loads((ABI_DIR / "erc20_abi.json").read_bytes())
+CORE_ABI = orjson.loads((ABI_DIR / "core_abi.json").read_bytes())
@@ -1,20 +1,24 @@
+from tenacity import (RetryCallState, RetryError, retry, retry_if_exception_type, stop_after_attempt,
+                      wait_exponential_jitter)
 from functools import wraps
 from aiohttp import ClientHttpProxyError
 from eth_account import Account
-from web3.middleware.geth_poa import async_geth_poa_middleware
 from web3.exceptions import TransactionNotFound
-from web3 import AsyncWeb3, AsyncHTTPProvider
+from web3 import AsyncWeb3
 from web3.contract import AsyncContract
-from typing import Optional, Union
+from typing import Any, Awaitable, Callable, Optional, Union
 from web3.types import TxParams
 from hexbytes import HexBytes
+from decimal import Decimal
 from client.networks import Network
+from abi import ERC20_ABI
 import asyncio
 import logging
-import json
 
-with open("abi/erc20_abi.json", "r", encoding="utf-8") as file:
-    ERC20_ABI = json.load(file)
+# Оценка газа одной транзакции при расчёте комиссии
+ESTIMATED_TX_GAS = 70_000
+# Лимит газа для supply, собираемого до подтверждения approve (оценка газа до аппрува ревертнется)
+SUPPLY_GAS_LIMIT = 300_000
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(
@@ -25,28 +29,35 @@ logging.basicConfig(
 
 
 def retry_on_proxy_error(max_attempts: int = 3, fallback_no_proxy: bool = True):
-    """Декоратор для повторных попыток при ошибках прокси."""
+    """Декоратор для повторных попыток при ошибках прокси (экспоненциальная задержка с джиттером)."""
 
     def decorator(func):
+        def log_retry(retry_state: RetryCallState) -> None:
+            logger.warning(f"🧹 Ошибка прокси (попытка {retry_state.attempt_number}/{max_attempts}): "
+                           f"{retry_state.outcome.exception()}")
+
+        retrying_func = retry(
+            wait=wait_exponential_jitter(initial=0.5, max=8),
+            stop=stop_after_attempt(max_attempts),
+            retry=retry_if_exception_type(ClientHttpProxyError),
+            before_sleep=log_retry
+        )(func)
+
         @wraps(func)
         async def wrapper(self, *args, **kwargs):
-            attempts = 0
-            last_error = None
-            while attempts < max_attempts:
-                try:
-                    return await func(self, *args, **kwargs)
-                except ClientHttpProxyError as e:
-                    attempts += 1
-                    last_error = e
-                    logger.warning(f"🧹 Ошибка прокси (попытка {attempts}/{max_attempts}): {e}")
-                    if attempts == max_attempts and fallback_no_proxy:
-                        logger.info("Отключаем прокси для последней попытки")
-                        self._disable_proxy()
-                        try:
-                            return await func(self, *args, **kwargs)
-                        except ClientHttpProxyError as e:
-                            last_error = e
-                    await asyncio.sleep(1)
+            try:
+                return await retrying_func(self, *args, **kwargs)
+            except RetryError as e:
+                last_error = e.last_attempt.exception()
+                # before_sleep не вызывается после последней попытки, поэтому логируем её здесь
+                logger.warning(f"🧹 Ошибка прокси (попытка {e.last_attempt.attempt_number}/{max_attempts}): {last_error}")
+                if fallback_no_proxy:
+                    logger.info("Отключаем прокси для последней попытки")
+                    self._disable_proxy()
+                    try:
+                        return await func(self, *args, **kwargs)
+                    except ClientHttpProxyError as e:
+                        last_error = e
             raise ValueError(f"❌ Не удалось выполнить запрос после {max_attempts} попыток: {last_error}")
 
         return wrapper
@@ -56,14 +67,15 @@ def retry_on_proxy_error(max_attempts: int = 3, fallback_no_proxy: bool = True):
 
 class Client:
     def __init__(self, ltoken_address: str, core_address: str, chain_id: int, rpc_url: str, private_key: str,
-                 amount: float, explorer_url: str, usdc_address: str, proxy: Optional[str] = None):
+                 amount: float, explorer_url: str, usdc_address: str, proxy: Optional[str] = None,
+                 concurrency: int = 8, max_rpc_calls_per_second: Optional[int] = None):
         request_kwargs = {"proxy": f"http://{proxy}"} if proxy else {}
-        self.ltoken_address = ltoken_address
+        self.ltoken_address = AsyncWeb3.to_checksum_address(ltoken_address)
         self.explorer_url = explorer_url
         self.private_key = private_key
         self.account = Account.from_key(self.private_key)
-        self.core_address = core_address
-        self.usdc_address = usdc_address
+        self.core_address = AsyncWeb3.to_checksum_address(core_address)
+        self.usdc_address = AsyncWeb3.to_checksum_address(usdc_address)
         self.chain_id = chain_id
         self.amount = amount
         self.rpc_url = rpc_url
@@ -77,16 +89,68 @@ class Client:
 
         self.chain_id = self.network.chain_id
 
-        # Инициализация AsyncWeb3
-        self.w3 = AsyncWeb3(AsyncHTTPProvider(rpc_url, request_kwargs=request_kwargs))
-        # Применяем middleware для PoA-сетей
-        if self.network.is_poa:
-            self.w3.middleware_onion.clear()
-            self.w3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
+        # Лимиты запросов к RPC: частота и число одновременных запросов
+        self.max_rpc_calls_per_second = max_rpc_calls_per_second
+        self.concurrency = concurrency
+
+        # Инициализация AsyncWeb3 (переиспользуется для одинаковых сети, RPC и прокси)
+        self.w3 = self.network.build_w3(rpc_url, request_kwargs, max_rpc_calls_per_second, concurrency)
 
         self.eip_1559 = True
-        self.address = self.w3.to_checksum_address(
-            self.w3.eth.account.from_key(self.private_key).address)
+        # Следующий nonce; None — нужно запросить у сети
+        self._nonce: Optional[int] = None
+        self._nonce_lock = asyncio.Lock()
+        # Подключена ли этим клиентом постоянная aiohttp-сессия (в __aenter__)
+        self._session_opened = False
+        # Кэш объектов контрактов: (адрес, id(abi)) -> контракт
+        self._contracts: dict[tuple[str, int], AsyncContract] = {}
+        # Выполняющиеся запросы для объединения одинаковых одновременных вызовов
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        # Кэш децималов токенов: адрес -> decimals
+        self._decimals_cache: dict[str, int] = {}
+        self.address = self.w3.to_checksum_address(self.account.address)
+
+    async def __aenter__(self) -> 'Client':
+        # Постоянная aiohttp-сессия с настроенным коннектором живёт в провайдере и общая для клиентов одного RPC;
+        # её подхватит и провайдер, пересозданный в _disable_proxy
+        await self.w3.provider.open_session()
+        self._session_opened = True
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    # Освобождение aiohttp-сессии, подключённой этим клиентом
+    async def close(self) -> None:
+        if self._session_opened:
+            self._session_opened = False
+            await self.w3.provider.close_session()
+
+    # Переключение на прямое подключение к RPC без прокси
+    def _disable_proxy(self) -> None:
+        self.proxy = None
+        self.w3 = self.network.build_w3(self.rpc_url, {}, self.max_rpc_calls_per_second, self.concurrency)
+        # Контракты привязаны к старому AsyncWeb3
+        self._contracts.clear()
+
+    # Объединение одинаковых одновременных запросов в один (singleflight)
+    def _singleflight(self, key: tuple, request: Callable[[], Awaitable[Any]]) -> Awaitable[Any]:
+        """Если запрос с таким ключом уже выполняется, ожидает его результат вместо нового запроса."""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(request())
+            self._inflight[key] = future
+
+            def on_done(done: asyncio.Future) -> None:
+                self._inflight.pop(key, None)
+                # Забираем исключение, чтобы asyncio не ругался "Task exception was never retrieved",
+                # если все ожидающие были отменены до завершения запроса
+                if not done.cancelled():
+                    done.exception()
+
+            future.add_done_callback(on_done)
+        # shield: отмена одного из ожидающих не отменяет общий запрос
+        return asyncio.shield(future)
 
     # Получение баланса нативного токена
     async def get_native_balance(self) -> float:
@@ -96,11 +160,14 @@ class Client:
 
     async def get_allowance(self, token_address: str, owner: str, spender: str) -> int:
         try:
-            contract = await self.get_contract(token_address, ERC20_ABI)
-            allowance = await contract.functions.allowance(
-                self.w3.to_checksum_address(owner),
-                self.w3.to_checksum_address(spender)
-            ).call()
+            contract = self.get_contract(token_address, ERC20_ABI)
+            allowance = await self._singleflight(
+                ("allowance", token_address, owner, spender),
+                lambda: contract.functions.allowance(
+                    self.w3.to_checksum_address(owner),
+                    self.w3.to_checksum_address(spender)
+                ).call()
+            )
             return allowance
         except Exception as e:
             logger.error(f"❌ Ошибка при получении allowance: {e}")
@@ -113,11 +180,17 @@ class Client:
         """
         from utils.wrappers import wrap_native_token
         if amount_wei is None:
+            await self._get_decimals(token_address)
             amount_wei = self.to_wei_main(self.amount, token_address)
 
-        tx = await wrap_native_token(self.w3, self.network.name, amount_wei, self.address)
-        signed = self.w3.eth.account.sign_transaction(tx, self.private_key)
-        tx_hash = await self.w3.eth.send_raw_transaction(signed.raw_transaction)
+        nonce = await self._next_nonce()
+        try:
+            tx = await wrap_native_token(self.w3, self.network.name, amount_wei, self.address, nonce)
+            signed = self.w3.eth.account.sign_transaction(tx, self.private_key)
+            tx_hash = await self.w3.eth.send_raw_transaction(signed.raw_transaction)
+        except Exception:
+            self._nonce = None
+            raise
         logger.info(f"🚀 Отправлен wrap-тx: {tx_hash.hex()}\n")
         return tx_hash.hex()
 
@@ -127,17 +200,21 @@ class Client:
         Разворачивает WETH/WBNB/... обратно в нативный токен.
         """
         from utils.wrappers import unwrap_native_token
-        tx = await unwrap_native_token(self.w3, self.network.name, amount_wei, self.address)
-        signed = self.w3.eth.account.sign_transaction(tx, self.private_key)
-        tx_hash = await self.w3.eth.send_raw_transaction(signed.raw_transaction)
+        nonce = await self._next_nonce()
+        try:
+            tx = await unwrap_native_token(self.w3, self.network.name, amount_wei, self.address, nonce)
+            signed = self.w3.eth.account.sign_transaction(tx, self.private_key)
+            tx_hash = await self.w3.eth.send_raw_transaction(signed.raw_transaction)
+        except Exception:
+            self._nonce = None
+            raise
         logger.info(f"🚀 Отправлен unwrap-тx: {tx_hash.hex()}\n")
         return tx_hash.hex()
 
     # Получение баланса ERC20
     async def get_erc20_balance(self) -> float | int:
 
-        contract = self.w3.eth.contract(
-            address=self.w3.to_checksum_address(self.usdc_address), abi=ERC20_ABI)
+        contract = self.get_contract(self.usdc_address, ERC20_ABI)
         try:
             balance = await contract.functions.balanceOf(self.address).call()
             return balance
@@ -146,96 +223,130 @@ class Client:
             return 0
 
     # Создание объекта контракт для дальнейшего обращения к нему
-    async def get_contract(self, contract_address: str, abi: list) -> AsyncContract:
-        return self.w3.eth.contract(
-            address=self.w3.to_checksum_address(contract_address), abi=abi
-        )
+    def get_contract(self, contract_address: str, abi: list) -> AsyncContract:
+        # Адрес приводится к checksum-формату только при первом обращении к контракту
+        key = (contract_address, id(abi))
+        contract = self._contracts.get(key)
+        if contract is None:
+            contract = self.w3.eth.contract(
+                address=self.w3.to_checksum_address(contract_address), abi=abi
+            )
+            self._contracts[key] = contract
+        return contract
 
     # Получение суммы газа за транзакцию
-    async def get_tx_fee(self) -> int:
+    async def get_tx_fee(self, gas_limit: int = ESTIMATED_TX_GAS) -> int:
+        return await self.get_fee_per_gas() * gas_limit
+
+    # Получение цены газа (base fee + чаевые)
+    async def get_fee_per_gas(self) -> int:
         try:
-            fee_history = await self.w3.eth.fee_history(10, "latest", [50])
+            fee_history, max_priority_fee = await asyncio.gather(
+                self.w3.eth.fee_history(1, "latest", []),
+                self.w3.eth.max_priority_fee
+            )
             base_fee = fee_history['baseFeePerGas'][-1]
-            max_priority_fee = await self.w3.eth.max_priority_fee
-            estimated_gas = 70_000
-            max_fee_per_gas = (base_fee + max_priority_fee) * estimated_gas
-
-            return max_fee_per_gas
+            return base_fee + max_priority_fee
         except Exception as e:
             logger.warning(f"Ошибка при расчёте комиссии, используем fallback: {e}")
-            fallback_gas_price = await self.w3.eth.gas_price
-            return fallback_gas_price * 70_000
-
-    # Преобразование в веи
-    async def to_wei_main(self, number: int | float, token_address: Optional[str] = None):
-        if token_address:
-            contract = await self.get_contract(token_address, ERC20_ABI)
-            decimals = await contract.functions.decimals().call()
-        else:
-            decimals = 18
-
-        unit_name = {
-            6: "mwei",
-            9: "gwei",
-            18: "ether"
-        }.get(decimals)
-
-        if not unit_name:
-            raise RuntimeError(f"Невозможно найти имя юнита с децималами: {decimals}")
-        return self.w3.to_wei(number, unit_name)
-
-    # Преобразование из веи
-    async def from_wei_main(self, number: int | float, token_address: Optional[str] = None):
-        if token_address:
-            contract = await self.get_contract(token_address, ERC20_ABI)
-            decimals = await contract.functions.decimals().call()
-        else:
-            decimals = 18
+            return await self.w3.eth.gas_price
+
+    # Получение децималов токена (с кэшированием)
+    async def _get_decimals(self, token_address: Optional[str] = None) -> int:
+        if not token_address:
+            return 18
+        decimals = self._decimals_cache.get(token_address)
+        if decimals is None:
+            contract = self.get_contract(token_address, ERC20_ABI)
+            decimals = await self._singleflight(("decimals", token_address),
+                                                lambda: contract.functions.decimals().call())
+            self._decimals_cache[token_address] = decimals
+        return decimals
+
+    # Сохранение уже известных децималов (например, полученных через multicall)
+    def cache_decimals(self, token_address: str, decimals: int) -> None:
+        self._decimals_cache[token_address] = decimals
+
+    def _get_cached_decimals(self, token_address: Optional[str] = None) -> int:
+        if not token_address:
+            return 18
+        try:
+            return self._decimals_cache[token_address]
+        except KeyError:
+            raise RuntimeError(f"Децималы токена {token_address} ещё не загружены")
 
-        unit_name = {
-            6: "mwei",
-            9: "gwei",
-            18: "ether"
-        }.get(decimals)
+    # Преобразование в веи без обращения к сети (децималы должны быть в кэше, см. _get_decimals)
+    def to_wei_main(self, number: int | float, token_address: Optional[str] = None) -> int:
+        return int(Decimal(str(number)) * 10 ** self._get_cached_decimals(token_address))
 
-        if not unit_name:
-            raise RuntimeError(f"Невозможно найти имя юнита с децималами: {decimals}")
-        return self.w3.from_wei(number, unit_name)
+    # Преобразование из веи без обращения к сети (децималы должны быть в кэше, см. _get_decimals)
+    def from_wei_main(self, number: int, token_address: Optional[str] = None) -> Decimal:
+        return Decimal(number) / Decimal(10 ** self._get_cached_decimals(token_address))
 
     # Метод для построения транзакции
     async def prepare_tx(self, value: Union[int, float] = 0) -> TxParams:
         """Подготавливает базовую транзакцию."""
         try:
-            nonce = await self.w3.eth.get_transaction_count(self.address)
-            chain_id = await self.w3.eth.chain_id
-            
+            nonce = await self._next_nonce()
+
             tx_params = {
                 'from': self.address,
                 'nonce': nonce,
-                'chainId': chain_id,
+                'chainId': self.chain_id,
             }
             
             if value > 0:
                 tx_params['value'] = value
                 
-            # Добавляем параметры EIP-1559 если поддерживается
-            if self.eip_1559:
-                base_fee = await self.w3.eth.gas_price
-                max_priority_fee = int(base_fee * 0.1) or 1_000_000  # Минимальная чаевая
-                max_fee = int(base_fee * 1.5 + max_priority_fee)
-                
-                tx_params.update({
-                    'maxFeePerGas': max_fee,
-                    'maxPriorityFeePerGas': max_priority_fee
-                })
-            else:
-                tx_params['gasPrice'] = await self.w3.eth.gas_price
-                
+            tx_params.update(await self._get_fee_params())
             return tx_params
         except Exception as e:
+            # Выданный nonce не будет использован — перезапросим его при следующей транзакции
+            self._nonce = None
             logger.error(f"Ошибка при подготовке транзакции: {e}")
             raise
 
+    # Параметры комиссии, с которыми подписываются транзакции
+    async def _get_fee_params(self) -> TxParams:
+        # Добавляем параметры EIP-1559 если поддерживается
+        if self.eip_1559:
+            base_fee = await self.w3.eth.gas_price
+            max_priority_fee = int(base_fee * 0.1) or 1_000_000  # Минимальная чаевая
+            max_fee = int(base_fee * 1.5 + max_priority_fee)
+            return {
+                'maxFeePerGas': max_fee,
+                'maxPriorityFeePerGas': max_priority_fee
+            }
+        return {'gasPrice': await self.w3.eth.gas_price}
+
+    # Максимальная цена газа подписываемых транзакций (по ней нода проверяет баланс при отправке)
+    async def get_max_fee_per_gas(self) -> int:
+        fee_params = await self._get_fee_params()
+        return fee_params['maxFeePerGas'] if self.eip_1559 else fee_params['gasPrice']
+
+    # Выдача следующего nonce из локального счётчика
+    async def _next_nonce(self) -> int:
+        # Блокировка не даёт одновременно собираемым транзакциям получить один и тот же nonce
+        async with self._nonce_lock:
+            if self._nonce is None:
+                self._nonce = await self.w3.eth.get_transaction_count(self.address)
+            nonce = self._nonce
+            self._nonce += 1
+            return nonce
+
+    # Метод для построения транзакции вызова контракта
+    async def build_tx(self, contract_function, value: Union[int, float] = 0, gas: Optional[int] = None) -> TxParams:
+        """Собирает транзакцию вызова контракта с параметрами из prepare_tx."""
+        tx_params = await self.prepare_tx(value)
+        if gas is not None:
+            tx_params['gas'] = gas
+        try:
+            return await contract_function.build_transaction(tx_params)
+        except Exception:
+            # Транзакция с выданным nonce не будет отправлена
+            self._nonce = None
+            raise
+
     # Метод для подписи и отправки транзакции
     async def sign_and_send_tx(self, transaction: TxParams, without_gas: bool = False) -> str:
         """Подписывает и отправляет транзакцию."""
@@ -256,6 +367,8 @@ class Client:
             tx_hash = await self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
             return tx_hash.hex()
         except Exception as e:
+            # Локальный nonce мог разойтись с сетью — перезапросим его при следующей транзакции
+            self._nonce = None
             logger.error(f"Ошибка при подписи или отправке транзакции: {e}")
             raise
 
@@ -273,37 +386,43 @@ class Client:
         tx_url = f"{explorer_url}tx/{tx_hash.hex()}" if explorer_url else f"Хэш транзакции: {tx_hash.hex()}"
         logger.info(f"⏳ Ожидание подтверждения транзакции: {tx_url}\n")
         
-        max_attempts = 50
-        for attempt in range(max_attempts):
+        # Опрашиваем с растущим интервалом (1с, 1.3с, ... до 5с) в пределах общего таймаута
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + 250
+        sleep_s = 1.0
+        while True:
             try:
                 receipt = await self.w3.eth.get_transaction_receipt(tx_hash)
-                if receipt is not None:
-                    if receipt['status'] == 1:
-                        logger.info(f"✅ Транзакция успешно подтверждена! Блок: {receipt['blockNumber']}\n")
-                        return True
-                    else:
-                        logger.error(f"❌ Транзакция не удалась. Подробности: {tx_url}\n")
-                        return False
+                break
             except TransactionNotFound:
                 pass  # Транзакция еще не включена в блок
             except Exception as e:
                 logger.error(f"Ошибка при проверке статуса транзакции: {e}")
                 # Продолжаем ожидание
-            
-            await asyncio.sleep(5)
-        
-        logger.warning(f"⚠️ Превышено время ожидания подтверждения транзакции: {tx_url}\n")
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                logger.warning(f"⚠️ Превышено время ожидания подтверждения транзакции: {tx_url}\n")
+                return False
+            await asyncio.sleep(min(sleep_s, remaining))
+            sleep_s = min(sleep_s * 1.3, 5.0)
+
+        if receipt['status'] == 1:
+            logger.info(f"✅ Транзакция успешно подтверждена! Блок: {receipt['blockNumber']}\n")
+            return True
+        logger.error(f"❌ Транзакция не удалась. Подробности: {tx_url}\n")
         return False
 
     # Метод для отправки approve-транзакции
     async def approve_usdc(self, usdc_contract, spender, amount):
         """Отправляет транзакцию для аппрува токена."""
         try:
-            logger.info(f"🔑 Подготовка транзакции аппрува USDC на сумму {await self.from_wei_main(amount, self.usdc_address):.6f}")
+            await self._get_decimals(self.usdc_address)
+            amount_view = self.from_wei_main(amount, self.usdc_address)
+            logger.info(f"🔑 Подготовка транзакции аппрува USDC на сумму {amount_view:.6f}")
             
             # Подготовка транзакции
-            tx_params = await self.prepare_tx()
-            tx = await usdc_contract.functions.approve(spender, amount).build_transaction(tx_params)
+            tx = await self.build_tx(usdc_contract.functions.approve(spender, amount))
             
             # Подпись и отправка
             tx_hash = await self.sign_and_send_tx(tx)
@@ -312,19 +431,7 @@ class Client:
             success = await self.wait_tx(tx_hash, self.explorer_url)
             if success:
                 logger.info(f"✅ Транзакция аппрува успешно подтверждена!")
-                
-                # Проверяем, что аппрув действительно установлен
-                try:
-                    new_allowance = await self.get_allowance(self.usdc_address, self.address, spender)
-                    if new_allowance >= amount:
-                        logger.info(f"✅ Аппрув успешно установлен. Разрешено: {await self.from_wei_main(new_allowance, self.usdc_address):.6f}\n")
-                        return True
-                    else:
-                        logger.warning(f"⚠️ Аппрув подтвержден, но allowance меньше требуемого: {await self.from_wei_main(new_allowance, self.usdc_address):.6f} < {await self.from_wei_main(amount, self.usdc_address):.6f}\n")
-                        return False
-                except Exception as e:
-                    logger.warning(f"⚠️ Не удалось проверить новый allowance: {e}\n")
-                    return True  # Предполагаем успех, так как транзакция прошла
+                return await self._verify_allowance(spender, amount)
             else:
                 logger.error(f"❌ Не удалось выполнить аппрув USDC\n")
                 return False
@@ -333,6 +440,63 @@ class Client:
             logger.error(f"❌ Ошибка при выполнении аппрува: {e}")
             raise
 
+    # Проверка, что аппрув действительно установлен
+    async def _verify_allowance(self, spender, amount) -> bool:
+        try:
+            await self._get_decimals(self.usdc_address)
+            new_allowance = await self.get_allowance(self.usdc_address, self.address, spender)
+            new_allowance_view = self.from_wei_main(new_allowance, self.usdc_address)
+            if new_allowance >= amount:
+                logger.info(f"✅ Аппрув успешно установлен. Разрешено: {new_allowance_view:.6f}\n")
+                return True
+            else:
+                amount_view = self.from_wei_main(amount, self.usdc_address)
+                logger.warning(f"⚠️ Аппрув подтвержден, но allowance меньше требуемого: {new_allowance_view:.6f} < {amount_view:.6f}\n")
+                return False
+        except Exception as e:
+            logger.warning(f"⚠️ Не удалось проверить новый allowance: {e}\n")
+            return True  # Предполагаем успех, так как транзакция прошла
+
+    # Метод для размещения USDC на LayerBank (аппрув уже установлен)
+    async def supply(self, core_contract, amount) -> bool:
+        """Отправляет транзакцию размещения и ожидает её подтверждения."""
+        tx = await self.build_tx(core_contract.functions.supply(self.ltoken_address, amount))
+
+        tx_hash = await self.sign_and_send_tx(tx)
+        logger.info(f"📝 Транзакция отправлена: {tx_hash}\n")
+
+        return await self.wait_tx(tx_hash, self.explorer_url)
+
+    # Метод для аппрува и размещения USDC без ожидания подтверждения аппрува
+    async def approve_and_supply(self, usdc_contract, core_contract, amount) -> bool:
+        """
+        Подписывает approve и supply сразу с nonce N и N+1 и ожидает их подтверждения параллельно.
+        Возвращает статус транзакции размещения.
+        """
+        # gather запускает сборку по порядку, поэтому approve получает nonce N, а supply — N + 1.
+        # До подтверждения approve оценка газа для supply ревертнется, поэтому газ фиксированный
+        approve_tx, supply_tx = await asyncio.gather(
+            self.build_tx(usdc_contract.functions.approve(self.ltoken_address, amount)),
+            self.build_tx(core_contract.functions.supply(self.ltoken_address, amount), gas=SUPPLY_GAS_LIMIT)
+        )
+
+        # Отправляем по порядку nonce, чтобы supply не пришёл на ноду раньше approve
+        approve_hash = await self.sign_and_send_tx(approve_tx)
+        logger.info(f"📝 Транзакция аппрува отправлена: {approve_hash}")
+        supply_hash = await self.sign_and_send_tx(supply_tx)
+        logger.info(f"📝 Транзакция отправлена: {supply_hash}\n")
+
+        approve_success, success = await asyncio.gather(
+            self.wait_tx(approve_hash, self.explorer_url),
+            self.wait_tx(supply_hash, self.explorer_url)
+        )
+        if not approve_success:
+            logger.error(f"❌ Не удалось выполнить аппрув USDC\n")
+        elif not success:
+            # Аппрув подтверждён, но supply не прошёл — проверяем, что allowance действительно установлен
+            await self._verify_allowance(self.ltoken_address, amount)
+        return success
+
     # Метод для построения swap транзакции
     async def build_swap_tx(self, quote_data: dict) -> TxParams:
         """
@@ -1,5 +1,28 @@
+from web3.middleware.geth_poa import async_geth_poa_middleware
+from client.provider import ThrottledAsyncHTTPProvider
+from asyncio_throttle import Throttler
+from typing import Any, Hashable, Optional
+from web3 import AsyncWeb3
 from enum import Enum
 
+# Уже настроенные экземпляры AsyncWeb3: (chain_id, rpc_url, request_kwargs, лимиты) -> AsyncWeb3.
+# Хранят только не привязанное к циклу событий состояние (семафоры создаёт провайдер для каждого цикла),
+# поэтому переиспользуются и между разными asyncio.run
+_W3_CACHE: dict[tuple, AsyncWeb3] = {}
+# Лимитеры частоты общие для одного RPC, в том числе с прокси и без: (rpc_url, лимит) -> Throttler
+_THROTTLERS: dict[tuple[str, int], Throttler] = {}
+
+
+def _freeze(value: Any) -> Hashable:
+    """Приводит request_kwargs (в том числе вложенные headers и т.п.) к хэшируемому виду для ключа кэша."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(_freeze(item) for item in value)
+    return value
+
 
 class Network(Enum):
     ETHEREUM = {"chain_id": 1, "is_poa": False}
@@ -46,3 +69,35 @@ class Network(Enum):
             return cls[name.upper()]
         except KeyError:
             raise ValueError(f"Неизвестная сеть: {name}. Поддерживаемые сети: {[n.name for n in cls]}")
+
+    def build_w3(self, rpc_url: str, request_kwargs: Optional[dict] = None,
+                 max_rpc_calls_per_second: Optional[int] = None, concurrency: Optional[int] = None) -> AsyncWeb3:
+        """
+        Возвращает настроенный AsyncWeb3 (с PoA-middleware при необходимости), создавая его один раз.
+        В кэшируемый объект не попадают примитивы asyncio: лимит конкурентности передаётся числом,
+        а семафор для него провайдер получает в текущем цикле событий.
+        """
+        request_kwargs = request_kwargs or {}
+        key = (self.chain_id, rpc_url, _freeze(request_kwargs), max_rpc_calls_per_second,
+               concurrency)
+        w3 = _W3_CACHE.get(key)
+        if w3 is not None:
+            return w3
+
+        throttler = None
+        if max_rpc_calls_per_second:
+            throttler_key = (rpc_url, max_rpc_calls_per_second)
+            throttler = _THROTTLERS.get(throttler_key)
+            if throttler is None:
+                throttler = Throttler(rate_limit=max_rpc_calls_per_second, period=1)
+                _THROTTLERS[throttler_key] = throttler
+
+        w3 = AsyncWeb3(ThrottledAsyncHTTPProvider(rpc_url, request_kwargs=request_kwargs,
+                                                  throttler=throttler, concurrency=concurrency))
+        # Применяем middleware для PoA-сетей
+        if self.is_poa:
+            w3.middleware_onion.clear()
+            w3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
+
+        _W3_CACHE[key] = w3
+        return w3
@@ -0,0 +1,86 @@
+from aiohttp import ClientSession, TCPConnector
+from asyncio_throttle import Throttler
+from contextlib import nullcontext
+from web3 import AsyncHTTPProvider
+from web3.types import RPCEndpoint, RPCResponse
+from typing import Any, Optional
+import asyncio
+
+# Примитивы asyncio и aiohttp-сессии привязаны к циклу событий, поэтому создаются отдельно для каждого цикла
+# и не переживают его: цикл -> {("semaphore", rpc_url, concurrency): Semaphore, ("session", rpc_url): [сессия, число клиентов]}
+_LOOP_STATE: dict[asyncio.AbstractEventLoop, dict[tuple, Any]] = {}
+
+
+def _get_loop_state() -> dict[tuple, Any]:
+    loop = asyncio.get_running_loop()
+    state = _LOOP_STATE.get(loop)
+    if state is None:
+        # Состояние закрытых циклов больше не нужно
+        for closed_loop in [known_loop for known_loop in _LOOP_STATE if known_loop.is_closed()]:
+            del _LOOP_STATE[closed_loop]
+        state = _LOOP_STATE[loop] = {}
+    return state
+
+
+def _get_semaphore(rpc_url: str, concurrency: int) -> asyncio.Semaphore:
+    """Возвращает общий для RPC семафор текущего цикла событий (в том числе для провайдеров с прокси и без)."""
+    state = _get_loop_state()
+    key = ("semaphore", rpc_url, concurrency)
+    semaphore = state.get(key)
+    if semaphore is None:
+        semaphore = state[key] = asyncio.Semaphore(concurrency)
+    return semaphore
+
+
+class ThrottledAsyncHTTPProvider(AsyncHTTPProvider):
+    """
+    AsyncHTTPProvider, ограничивающий частоту запросов к RPC (token bucket)
+    и число одновременно выполняющихся запросов.
+    """
+
+    def __init__(self, endpoint_uri: str, request_kwargs: Optional[dict] = None,
+                 throttler: Optional[Throttler] = None, concurrency: Optional[int] = None):
+        super().__init__(endpoint_uri, request_kwargs=request_kwargs)
+        self.throttler = throttler
+        self.concurrency = concurrency
+
+    async def open_session(self) -> None:
+        """
+        Подключает к RPC постоянную aiohttp-сессию с настроенным коннектором в текущем цикле событий.
+        Сессия общая для всех клиентов этого RPC и закрывается, когда её освободит последний из них.
+        """
+        state = _get_loop_state()
+        key = ("session", self.endpoint_uri)
+        entry = state.get(key)
+        if entry is None or entry[0].closed:
+            connector = TCPConnector(limit=128, limit_per_host=64, ttl_dns_cache=300, enable_cleanup_closed=True)
+            entry = state[key] = [ClientSession(connector=connector, raise_for_status=True), 0]
+        entry[1] += 1
+
+    async def close_session(self) -> None:
+        """Освобождает сессию, подключённую open_session."""
+        state = _get_loop_state()
+        key = ("session", self.endpoint_uri)
+        entry = state.get(key)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del state[key]
+            await entry[0].close()
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        state = _get_loop_state()
+        semaphore = _get_semaphore(self.endpoint_uri, self.concurrency) if self.concurrency else None
+        async with semaphore or nullcontext():
+            async with self.throttler or nullcontext():
+                entry = state.get(("session", self.endpoint_uri))
+                if entry is None:
+                    # Без open_session работаем через стандартную сессию web3
+                    return await super().make_request(method, params)
+
+                request_data = self.encode_rpc_request(method, params)
+                async with entry[0].post(self.endpoint_uri, data=request_data,
+                                         **self.get_request_kwargs()) as response:
+                    raw_response = await response.read()
+                return self.decode_rpc_response(raw_response)
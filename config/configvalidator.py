@@ -9,6 +9,8 @@ import os
 import re
 
 MIN_AMOUNT = Decimal(0.00001)
+DEFAULT_CONCURRENCY = 8
+DEFAULT_MAX_RPC_CALLS_PER_SECOND = 10
 logger = logging.getLogger(__name__)
 load_dotenv(dotenv_path=".env")
 
@@ -117,6 +119,12 @@ class ConfigValidator:
         await self.validate_amount(self.config_data["amount"])
         await self.validate_proxy(self.config_data["proxy"])
 
+        self.config_data.setdefault("concurrency", DEFAULT_CONCURRENCY)
+        await self.validate_concurrency(self.config_data["concurrency"])
+
+        self.config_data.setdefault("max_rpc_calls_per_second", DEFAULT_MAX_RPC_CALLS_PER_SECOND)
+        await self.validate_max_rpc_calls_per_second(self.config_data["max_rpc_calls_per_second"])
+
         return self.config_data
 
     async def validate_required_keys(self):
@@ -203,3 +211,17 @@ class ConfigValidator:
         if amount < MIN_AMOUNT:
             logging.error("Количество токенов для отправки слишком мало, введите значение больше 0.0001.")
             exit(1)
+
+    @staticmethod
+    async def validate_concurrency(concurrency: int) -> None:
+        """Валидация лимита одновременных запросов к RPC"""
+        if not isinstance(concurrency, int) or isinstance(concurrency, bool) or concurrency < 1:
+            logging.error("Ошибка: 'concurrency' должен быть целым числом больше нуля.")
+            exit(1)
+
+    @staticmethod
+    async def validate_max_rpc_calls_per_second(max_calls: int) -> None:
+        """Валидация лимита запросов к RPC в секунду"""
+        if not isinstance(max_calls, int) or isinstance(max_calls, bool) or max_calls < 1:
+            logging.error("Ошибка: 'max_rpc_calls_per_second' должен быть целым числом больше нуля.")
+            exit(1)
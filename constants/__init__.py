@@ -0,0 +1,4 @@
+from pathlib import Path
+import orjson
+
+NETWORKS_DATA = orjson.loads((Path(__file__).parent / "networks_data.json").read_bytes())
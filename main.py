@@ -1,23 +1,20 @@
-from eth_utils import to_checksum_address
 from config.configvalidator import ConfigValidator
-from client.client import Client
+from utils.multicall import aggregate
 from utils.logger import logger
 import asyncio
-import json
+import orjson
 import sys
 
-# Load ABI files
+# Load ABI files and networks data (client.client imports ABI from the abi package too)
 try:
-    with open("abi/core_abi.json", "r", encoding="utf-8") as f:
-        CORE_ABI = json.load(f)
-
-    with open("abi/erc20_abi.json", "r", encoding="utf-8") as f:
-        ERC20_ABI = json.load(f)
+    from abi import CORE_ABI, ERC20_ABI
+    from constants import NETWORKS_DATA
+    from client.client import Client, ESTIMATED_TX_GAS, SUPPLY_GAS_LIMIT
 except FileNotFoundError as e:
-    logger.error(f"Ошибка при загрузке ABI файлов: {e}")
+    logger.error(f"Ошибка при загрузке ABI файлов или данных сетей: {e}")
     sys.exit(1)
-except json.JSONDecodeError as e:
-    logger.error(f"Ошибка при парсинге ABI файлов: {e}")
+except orjson.JSONDecodeError as e:
+    logger.error(f"Ошибка при парсинге ABI файлов или данных сетей: {e}")
     sys.exit(1)
 
 
@@ -29,86 +26,93 @@ async def main():
         validator = ConfigValidator("config/settings.json")
         settings = await validator.validate_config()
 
-        try:
-            with open("constants/networks_data.json", "r", encoding="utf-8") as file:
-                networks_data = json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            logger.error(f"Ошибка при загрузке данных сетей: {e}")
-            sys.exit(1)
-
-        if settings["network"] not in networks_data:
+        if settings["network"] not in NETWORKS_DATA:
             logger.error(f"Сеть {settings['network']} не найдена в файле данных сетей")
             sys.exit(1)
 
-        network = networks_data[settings["network"]]
+        network = NETWORKS_DATA[settings["network"]]
 
         client = Client(
             proxy=settings["proxy"],
             rpc_url=network["rpc_url"],
             chain_id=network["chain_id"],
             amount=float(settings["amount"]),
+            concurrency=settings["concurrency"],
+            max_rpc_calls_per_second=settings["max_rpc_calls_per_second"],
             private_key=settings["private_key"],
             explorer_url=network["explorer_url"],
-            usdc_address=to_checksum_address(network["usdc_address"]),
-            core_address=to_checksum_address(network["core_address"]),
-            ltoken_address=to_checksum_address(network["ltoken_address"])
+            usdc_address=network["usdc_address"],
+            core_address=network["core_address"],
+            ltoken_address=network["ltoken_address"]
         )
 
-        # Проверка баланса
-        amount_in = await client.to_wei_main(client.amount, client.usdc_address)
-        erc20_balance = await client.get_erc20_balance()
-        native_balance = await client.get_native_balance()
-        gas = await client.get_tx_fee()
-        
-        logger.info(f"💰 Баланс USDC: {await client.from_wei_main(erc20_balance, client.usdc_address):.6f}")
-        logger.info(f"⛽ Расчетная стоимость газа: {await client.from_wei_main(gas):.8f}\n")
-        
-        if amount_in > erc20_balance:
-            logger.error(f"Недостаточно баланса USDC! Требуется: {await client.from_wei_main(amount_in, client.usdc_address):.6f}"
-                         f" фактический баланс: {await client.from_wei_main(erc20_balance, client.usdc_address):.6f}\n")
-            sys.exit(1)
-        if native_balance < gas:
-            logger.error(f"Недостаточно средств для оплаты газа! Требуется: {await client.from_wei_main(gas):.8f}"
-                         f" фактический баланс: {await client.from_wei_main(native_balance):.8f}\n")
-            sys.exit(1)
-
-        # Аппрув токена и обращение к контракту
-        usdc_contract = await client.get_contract(to_checksum_address(client.usdc_address), abi=ERC20_ABI)
-
-        # Проверяем текущий allowance
-        current_allowance = await client.get_allowance(client.usdc_address, client.address, client.ltoken_address)
-        if current_allowance < amount_in:
-            logger.info(f"💸 Требуется аппрув USDC на сумму {await client.from_wei_main(amount_in, client.usdc_address):.6f}\n")
-            await client.approve_usdc(usdc_contract, client.ltoken_address, amount_in)
-        else:
-            logger.info(f"✅ Аппрув уже установлен, пропускаем этап аппрува\n")
-
-        core = await client.get_contract(to_checksum_address(client.core_address), abi=CORE_ABI)
-
-        logger.info("⚙️ Собираем и подписываем транзакцию размещения...\n")
-        try:
-            tx = await core.functions.supply(client.ltoken_address, amount_in).build_transaction(
-                await client.prepare_tx())
-
-            tx_hash = await client.sign_and_send_tx(tx)
-            logger.info(f"📝 Транзакция отправлена: {tx_hash}\n")
-
-            success = await client.wait_tx(tx_hash, client.explorer_url)
-            if success:
-                logger.info(f"✅ USDC успешно размещены на LayerBank! Сумма: {await client.from_wei_main(amount_in, client.usdc_address):.6f}\n")
-                
-                # Проверяем обновленный баланс lToken
-                try:
-                    ltoken_contract = await client.get_contract(client.ltoken_address, ERC20_ABI)
-                    ltoken_balance = await ltoken_contract.functions.balanceOf(client.address).call()
-                    logger.info(f"🏦 Ваш баланс lUSDC: {await client.from_wei_main(ltoken_balance, client.ltoken_address):.6f}\n")
-                except Exception as e:
-                    logger.warning(f"Не удалось получить баланс lUSDC: {e}\n")
-            else:
-                logger.error(f"❌ Не удалось разместить USDC на LayerBank\n")
-        except Exception as e:
-            logger.error(f"❌ Ошибка при размещении USDC: {e}\n")
-            sys.exit(1)
+        # Постоянная aiohttp-сессия на всё время работы, закрывается при выходе
+        async with client:
+            usdc_contract = client.get_contract(client.usdc_address, abi=ERC20_ABI)
+
+            # Проверка баланса: чтения USDC идут одним multicall, остальные запросы — одновременно с ним
+            (decimals, erc20_balance, current_allowance), native_balance, max_fee_per_gas = await asyncio.gather(
+                aggregate(client.w3, [
+                    (usdc_contract, "decimals", []),
+                    (usdc_contract, "balanceOf", [client.address]),
+                    (usdc_contract, "allowance", [client.address, client.ltoken_address])
+                ]),
+                client.get_native_balance(),
+                client.get_max_fee_per_gas()
+            )
+            client.cache_decimals(client.usdc_address, decimals)
+            amount_in = client.to_wei_main(client.amount, client.usdc_address)
+
+            # Если нужен аппрув, отправляются две транзакции: approve и supply с фиксированным лимитом газа.
+            # Считаем по той же maxFeePerGas, с которой prepare_tx подписывает транзакции
+            need_approve = current_allowance < amount_in
+            gas = max_fee_per_gas * (ESTIMATED_TX_GAS + SUPPLY_GAS_LIMIT if need_approve else ESTIMATED_TX_GAS)
+
+            amount_in_view = client.from_wei_main(amount_in, client.usdc_address)
+            erc20_balance_view = client.from_wei_main(erc20_balance, client.usdc_address)
+            gas_view = client.from_wei_main(gas)
+            logger.info(f"💰 Баланс USDC: {erc20_balance_view:.6f}")
+            logger.info(f"⛽ Расчетная стоимость газа: {gas_view:.8f}\n")
+
+            if amount_in > erc20_balance:
+                logger.error(f"Недостаточно баланса USDC! Требуется: {amount_in_view:.6f}"
+                             f" фактический баланс: {erc20_balance_view:.6f}\n")
+                sys.exit(1)
+            if native_balance < gas:
+                logger.error(f"Недостаточно средств для оплаты газа! Требуется: {gas_view:.8f}"
+                             f" фактический баланс: {client.from_wei_main(native_balance):.8f}\n")
+                sys.exit(1)
+
+            core = client.get_contract(client.core_address, abi=CORE_ABI)
+
+            logger.info("⚙️ Собираем и подписываем транзакцию размещения...\n")
+            try:
+                if need_approve:
+                    logger.info(f"💸 Требуется аппрув USDC на сумму {amount_in_view:.6f}\n")
+                    success = await client.approve_and_supply(usdc_contract, core, amount_in)
+                else:
+                    logger.info(f"✅ Аппрув уже установлен, пропускаем этап аппрува\n")
+                    success = await client.supply(core, amount_in)
+
+                if success:
+                    logger.info(f"✅ USDC успешно размещены на LayerBank! Сумма: {amount_in_view:.6f}\n")
+
+                    # Проверяем обновленный баланс lToken
+                    try:
+                        ltoken_contract = client.get_contract(client.ltoken_address, ERC20_ABI)
+                        ltoken_decimals, ltoken_balance = await aggregate(client.w3, [
+                            (ltoken_contract, "decimals", []),
+                            (ltoken_contract, "balanceOf", [client.address])
+                        ])
+                        client.cache_decimals(client.ltoken_address, ltoken_decimals)
+                        logger.info(f"🏦 Ваш баланс lUSDC: {client.from_wei_main(ltoken_balance, client.ltoken_address):.6f}\n")
+                    except Exception as e:
+                        logger.warning(f"Не удалось получить баланс lUSDC: {e}\n")
+                else:
+                    logger.error(f"❌ Не удалось разместить USDC на LayerBank\n")
+            except Exception as e:
+                logger.error(f"❌ Ошибка при размещении USDC: {e}\n")
+                sys.exit(1)
 
     except Exception as e:
         logger.error(f"Произошла ошибка в основном пути: {e}")
@@ -0,0 +1,73 @@
+from eth_utils.abi import collapse_if_tuple
+from web3.contract import AsyncContract
+from web3 import AsyncWeb3
+from typing import Any
+
+# Multicall3 задеплоен по одному и тому же адресу в большинстве EVM-сетей
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    }
+]
+
+
+# Контракт Multicall3 для каждого AsyncWeb3 (экземпляры AsyncWeb3 сами мемоизируются в Network.build_w3)
+_MULTICALL_CONTRACTS: dict[AsyncWeb3, AsyncContract] = {}
+
+
+def _get_multicall_contract(w3: AsyncWeb3) -> AsyncContract:
+    contract = _MULTICALL_CONTRACTS.get(w3)
+    if contract is None:
+        contract = w3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+        _MULTICALL_CONTRACTS[w3] = contract
+    return contract
+
+
+async def aggregate(w3: AsyncWeb3, calls: list[tuple[AsyncContract, str, list]],
+                    allow_failure: bool = False) -> list[Any]:
+    """
+    Выполняет несколько view-вызовов одним eth_call через Multicall3.aggregate3.
+    Каждый вызов задаётся как (контракт, имя функции, аргументы).
+    Для неудавшихся вызовов (при allow_failure=True) возвращается None.
+    """
+    multicall = _get_multicall_contract(w3)
+    encoded_calls = [
+        (contract.address, allow_failure, contract.encodeABI(fn_name=fn_name, args=args))
+        for contract, fn_name, args in calls
+    ]
+    results = await multicall.functions.aggregate3(encoded_calls).call()
+
+    decoded = []
+    for (contract, fn_name, _), (success, return_data) in zip(calls, results):
+        if not success:
+            decoded.append(None)
+            continue
+        output_types = [collapse_if_tuple(output) for output in contract.get_function_by_name(fn_name).abi["outputs"]]
+        values = w3.codec.decode(output_types, return_data)
+        decoded.append(values[0] if len(values) == 1 else values)
+    return decoded